@@ -0,0 +1,26 @@
+     CREATE UNLOGGED TABLE audit_event_fact (
+       load_id int NOT NULL,
+       audit_id text NOT NULL,
+       endpoint text,
+       useragent_id int,
+       test_id int,
+       test_hit boolean,
+       error text,
+       conf_test_hit boolean,
+       data jsonb,
+       id int GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+       ingested_at timestamp DEFAULT CURRENT_TIMESTAMP);
+
+     comment on table audit_event_fact is 'every event from an e2e test run, or multiple test runs, with repeated text kept as keys into audit_event_load, audit_event_useragent and audit_event_codename.  Read through the audit_event view for the full text.';
+
+     comment on column audit_event_fact.load_id is 'id of the audit_event_load this event came in with, giving its release, release_date and source';
+     comment on column audit_event_fact.audit_id is 'audit event id as given in log.  Note these are not necessarily unique.';
+     comment on column audit_event_fact.endpoint is 'endpoint hit by this audit event';
+     comment on column audit_event_fact.useragent_id is 'id of the useragent of the event in audit_event_useragent';
+     comment on column audit_event_fact.test_id is 'id of the test codename in audit_event_codename if it can be extracted from useragent, else null';
+     comment on column audit_event_fact.test_hit is 'is the useragent of the event a test?';
+     comment on column audit_event_fact.conf_test_hit is 'is the useragent of the event a conformance test?';
+     comment on column audit_event_fact.error is 'error message if there was issue finding endpoint for event';
+     comment on column audit_event_fact.data is 'the full json of the audit event, or null when it was archived to audit_event_payload';
+     comment on column audit_event_fact.id is 'generated id, this will be unique';
+     comment on column audit_event_fact.ingested_at is 'the time at which the audit_event was added to this table';
@@ -0,0 +1,21 @@
+create table audit_event_load
+  (
+    id int generated by default as identity primary key,
+    release text not null,
+    release_date text,
+    bucket text,
+    job text,
+    source text,
+    event_count bigint,
+    loaded_at timestamp default current_timestamp
+  );
+
+comment on table audit_event_load is 'one row per test run loaded into audit_event, by load_audit_events.  Holds the release, release_date and source shared by all events of the run.';
+comment on column audit_event_load.id is 'generated id, increases with every load';
+comment on column audit_event_load.release is 'release the events of this load were assigned to';
+comment on column audit_event_load.release_date is 'canonical release date (or test run date if version not released yet)';
+comment on column audit_event_load.bucket is 'bucket the test run logs were taken from';
+comment on column audit_event_load.job is 'job id of the test run';
+comment on column audit_event_load.source is 'url of the test run, as given in audit_event.source';
+comment on column audit_event_load.event_count is '# of audit events loaded';
+comment on column audit_event_load.loaded_at is 'the time at which the events were loaded';
@@ -0,0 +1,13 @@
+create table coverage_export
+  (
+    release text primary key,
+    fingerprint text not null,
+    path text,
+    exported_at timestamp default current_timestamp
+  );
+
+comment on table coverage_export is 'last coverage json written per release, by export_coverage_jsons';
+comment on column coverage_export.release is 'release of the exported coverage json';
+comment on column coverage_export.fingerprint is 'hash of the inputs the coverage json was built from';
+comment on column coverage_export.path is 'file the coverage json was written to';
+comment on column coverage_export.exported_at is 'the time at which the coverage json was written';
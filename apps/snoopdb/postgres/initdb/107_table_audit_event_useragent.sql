@@ -0,0 +1,10 @@
+     CREATE UNLOGGED TABLE audit_event_useragent (
+       id int GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+       useragent text NOT NULL UNIQUE,
+       test_id int);
+
+     comment on table audit_event_useragent is 'every distinct useragent seen in audit_event, stored once';
+
+     comment on column audit_event_useragent.id is 'generated id, referenced by audit_event_fact.useragent_id';
+     comment on column audit_event_useragent.useragent is 'useragent, taken from the request header of an event';
+     comment on column audit_event_useragent.test_id is 'id of the test codename in audit_event_codename if useragent is an e2e test, else null';
@@ -0,0 +1,8 @@
+     CREATE UNLOGGED TABLE audit_event_codename (
+       id int GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+       test text NOT NULL UNIQUE);
+
+     comment on table audit_event_codename is 'every distinct test codename seen in audit_event, stored once';
+
+     comment on column audit_event_codename.id is 'generated id, referenced by audit_event_fact.test_id';
+     comment on column audit_event_codename.test is 'the test codename as extracted from a useragent, would be codename in conformance.yaml';
@@ -0,0 +1,29 @@
+     CREATE UNLOGGED TABLE audit_event_payload (
+       event_range int4range NOT NULL,
+       event_ids int[] NOT NULL,
+       data jsonb NOT NULL,
+       -- the gist index behind this finds the chunk holding an event id
+       EXCLUDE USING gist (event_range WITH &&));
+
+     -- postgres only compresses values of rows over ~2kB, which most single events are not.
+     -- payloads are stored in chunks of events from one load, so every chunk is compressed.
+     ALTER TABLE audit_event_payload ALTER COLUMN data SET COMPRESSION lz4;
+
+     comment on table audit_event_payload is 'compressed archive of the full json of audit events loaded with archive_data, in chunks of events from the same load, kept out of audit_event_fact so scans of it stay narrow';
+
+     comment on column audit_event_payload.event_range is 'range of audit_event_fact ids this chunk covers';
+     comment on column audit_event_payload.event_ids is 'ids of the events in this chunk, in the order of data';
+     comment on column audit_event_payload.data is 'array of the full json of each audit event in this chunk';
+
+     -- defined here rather than with the other functions, as the audit_event view depends on it
+     create or replace function archived_event_data(event_id int)
+       returns jsonb
+       language sql stable
+     as $$
+       select chunk.data -> (array_position(chunk.event_ids, event_id) - 1)
+         from audit_event_payload chunk
+        where chunk.event_range @> event_id
+          and event_id = any(chunk.event_ids);
+     $$;
+
+     comment on function archived_event_data is 'given an audit_event_fact id, return the full json of the event from audit_event_payload, or null if it was not archived';
@@ -4,13 +4,24 @@ select release, endpoint, level, category, path, description,
        k8s_version as version,
        k8s_group as group,
        k8s_action as action,
-       (count(test_hit) filter(where test_hit is true)>0) as tested,
-       (count(conf_test_hit) filter(where conf_test_hit is true)>0) as conf_tested,
-       array_agg(distinct test) as tests
+       coalesce(hits.tested, false) as tested,
+       coalesce(hits.conf_tested, false) as conf_tested,
+       -- test names are looked up once per distinct test, not once per event
+       coalesce((select array_agg(codename.test order by codename.test)
+                   from      unnest(hits.test_ids) test_id
+                   left join audit_event_codename codename on(codename.id = test_id)),
+                array[null]::text[]) as tests
   from      open_api
-  left join audit_event using (endpoint, release)
+  left join (
+    select load.release, event.endpoint,
+           bool_or(event.test_hit) as tested,
+           bool_or(event.conf_test_hit) as conf_tested,
+           array_agg(distinct event.test_id) as test_ids
+      from audit_event_fact event
+      join audit_event_load load on(event.load_id = load.id)
+     group by load.release, event.endpoint
+  ) hits using (endpoint, release)
  where deprecated is false
- group by release, endpoint, level, category, path, description, kind, version, k8s_group, k8s_action
  order by level desc, endpoint;
 
 comment on view endpoint_coverage is 'Coverage info for every endpoint in a release, taken from audit events for that release';
@@ -5,9 +5,13 @@ create or replace view audit_event_test as
            test.testname,
          test.file,
          test.release as promotion_release
-    from      audit_event event
+    from (
+      select load.release, codename.test
+        from (select distinct load_id, test_id from audit_event_fact where test_id is not null) event
+        join audit_event_load load on(event.load_id = load.id)
+        join audit_event_codename codename on(event.test_id = codename.id)
+    ) event
     left join conformance.test test on(event.test = test.codename)
-   where test is not null
    group by test, testname, file, test.release, event.release;
 
 comment on view audit_event_test is 'every test in the audit_log of a release';
@@ -10,7 +10,11 @@ create materialized view conformance.eligible_endpoint_coverage as
        from
                  open_api oa
       inner join conformance.eligible_endpoint using(endpoint)
-       left join audit_event ae using(endpoint)
+       left join (
+         select distinct event.endpoint, codename.test
+           from audit_event_fact event
+           join audit_event_codename codename on(event.test_id = codename.id)
+       ) ae using(endpoint)
        left join conformance.test test on (ae.test = test.codename)
 group by endpoint;
 
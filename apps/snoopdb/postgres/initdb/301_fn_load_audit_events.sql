@@ -1,24 +1,23 @@
       create or replace function load_audit_events(
         bucket text,
-        custom_job text default null)
+        custom_job text default null,
+        archive_data boolean default false)
 
         returns text AS $$
         from string import Template
-        from urllib.request import urlopen
         import json
-        import yaml
         import semver
-        from snoopUtils import download_and_process_auditlogs, get_meta
+        from snoopUtils import download_and_process_auditlogs, get_meta, get_source
 
-        RELEASES_URL = "https://raw.githubusercontent.com/kubernetes-sigs/apisnoop/master/resources/coverage/releases.yaml"
-
-        releases = yaml.safe_load(urlopen(RELEASES_URL))
+        # one source for releases, meta and logs, so its fetched files are reused
+        source = get_source()
+        releases = source.releases()
         latest_release = releases[0]['version']
 
-        meta = get_meta(bucket,custom_job)
+        meta = get_meta(bucket,custom_job,source)
         plpy.log("our bucket and job", detail=[bucket,meta.job])
 
-        auditlog_file = download_and_process_auditlogs(bucket, meta.job)
+        auditlog_file = download_and_process_auditlogs(bucket, meta.job, source)
 
         release_date = int(meta.timestamp)
 
@@ -30,39 +29,76 @@
         release = meta.version if semver.compare(meta.version,latest_release) < 1 else latest_release
 
         sql = Template("""
-          CREATE TEMPORARY TABLE audit_event_import${job}(data jsonb not null) ;
+          CREATE TEMPORARY TABLE audit_event_import${job}(
+            id int default nextval(pg_get_serial_sequence('audit_event_fact', 'id')),
+            data jsonb not null) ;
           COPY audit_event_import${job}(data)
           FROM '${audit_logfile}' (DELIMITER e'\x02', FORMAT 'csv', QUOTE e'\x01');
 
-          INSERT INTO audit_event(release, release_date,
-                                  audit_id, endpoint,
-                                  error,
-                                  useragent, test,
-                                  test_hit, conf_test_hit,
-                                  data, source)
+          INSERT INTO audit_event_load(release, release_date, bucket, job, source, event_count)
+          SELECT '${release}', '${release_date}', '${bucket}', '${job}',
+                 'https://prow.k8s.io/view/gcs/kubernetes-jenkins/logs/${bucket}/${job}',
+                 count(*)
+            FROM audit_event_import${job};
+
+          -- intern useragents and the test codenames within them, so events only carry their ids
+          INSERT INTO audit_event_useragent(useragent)
+          SELECT DISTINCT (raw.data ->> 'userAgent')
+            FROM audit_event_import${job} raw
+           WHERE (raw.data ->> 'userAgent') is not null
+              ON CONFLICT (useragent) DO NOTHING;
+
+          INSERT INTO audit_event_codename(test)
+          SELECT DISTINCT trim(split_part(useragent, '--'::text, 2))
+            FROM audit_event_useragent
+           WHERE useragent like 'e2e.test%'
+             AND test_id is null
+              ON CONFLICT (test) DO NOTHING;
 
-          SELECT  '${release}' as release,
-                  '${release_date}',
+          UPDATE audit_event_useragent ua
+             SET test_id = codename.id
+            FROM audit_event_codename codename
+           WHERE ua.useragent like 'e2e.test%'
+             AND ua.test_id is null
+             AND codename.test = trim(split_part(ua.useragent, '--'::text, 2));
+
+          INSERT INTO audit_event_fact(id, load_id,
+                                       audit_id, endpoint,
+                                       error,
+                                       useragent_id, test_id,
+                                       test_hit, conf_test_hit,
+                                       data)
+
+          SELECT  raw.id,
+                  currval(pg_get_serial_sequence('audit_event_load', 'id')) as load_id,
                   (raw.data ->> 'auditID'),
                   (raw.data ->> 'operationId') as endpoint,
                   (raw.data ->> 'snoopError') as error,
-                  (raw.data ->> 'userAgent') as useragent,
-                  CASE
-                    WHEN ((raw.data ->> 'userAgent') like 'e2e.test%')
-                      THEN trim(split_part((raw.data->>'userAgent'), '--'::text, 2))
-                    ELSE null
-                  END as test,
-                  ((raw.data ->> 'userAgent') like 'e2e.test%') as test_hit,
-                  ((raw.data ->> 'userAgent') like '%[Conformance]%') as conf_test_hit,
-                  raw.data,
-                  'https://prow.k8s.io/view/gcs/kubernetes-jenkins/logs/${bucket}/${job}' as source
-            FROM audit_event_import${job} raw;
+                  ua.id as useragent_id,
+                  ua.test_id,
+                  (ua.useragent like 'e2e.test%') as test_hit,
+                  (ua.useragent like '%[Conformance]%') as conf_test_hit,
+                  CASE WHEN ${archive_data} THEN null ELSE raw.data END
+            FROM      audit_event_import${job} raw
+            LEFT JOIN audit_event_useragent ua on(ua.useragent = (raw.data ->> 'userAgent'));
+
+          -- archived payloads go to their own table in chunks of 64 events,
+          -- big enough for postgres to compress each chunk
+          INSERT INTO audit_event_payload(event_range, event_ids, data)
+          SELECT int4range(min(raw.id), max(raw.id), '[]'),
+                 array_agg(raw.id order by raw.id),
+                 jsonb_agg(raw.data order by raw.id)
+            FROM (select id, data, (row_number() over (order by id) - 1) / 64 as chunk
+                    from audit_event_import${job}) raw
+           WHERE ${archive_data}
+           GROUP BY raw.chunk;
                   """).substitute(
                       audit_logfile = auditlog_file,
                       release = release,
                       bucket = bucket,
                       job = meta.job,
-                      release_date = release_date
+                      release_date = release_date,
+                      archive_data = 'true' if archive_data else 'false'
                   )
         try:
             plpy.execute(sql)
@@ -75,6 +111,6 @@
         $$ LANGUAGE plpython3u ;
         reset role;
 
-      comment on function load_audit_events is 'loads all audit events from given bucket, job.  if neither given, loads latest successful job from sig-release blocking. if just bucket given, loads latest successful job for that bucket.';
+      comment on function load_audit_events is 'loads all audit events from given bucket, job.  if neither given, loads latest successful job from sig-release blocking. if just bucket given, loads latest successful job for that bucket.  if archive_data, the full json of each event is stored in audit_event_payload instead of audit_event_fact.';
 
      select 'load_audit_events function defined and commented' as "build log";
@@ -2,7 +2,7 @@ create function generate_latest_coverage_json()
 returns json as $$
 declare latest_release varchar;
 begin
-select release into latest_release from audit_event order by release::semver limit 1;
+select release into latest_release from audit_event_load order by release::semver limit 1;
 return(
 select jsonb_pretty(row_to_json(c)::jsonb) from (
     select open_api.release, open_api.release_date, open_api.spec,
@@ -12,7 +12,7 @@ select jsonb_pretty(row_to_json(c)::jsonb) from (
         cpr."total tested" as "tested conformance eligible endpoints",
         cpr."new endpoints" as "new conformance eligible endpoints",
         cpr.tested as "new tested conformance eligible endpoints",
-        (select array_agg(source) from (select source from audit_event where release = latest_release group by source) s) as sources,
+        (select array_agg(source) from (select source from audit_event_load where release = latest_release group by source) s) as sources,
         (select array_agg(row_to_json(endpoint_coverage)) from endpoint_coverage where release = latest_release and endpoint is not null) as endpoints,
         (select array_agg(row_to_json(audit_event_test)) from audit_event_test where release = latest_release) as tests
     from open_api
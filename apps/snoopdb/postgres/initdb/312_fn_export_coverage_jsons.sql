@@ -0,0 +1,77 @@
+create or replace function export_coverage_jsons(
+  output_dir text default '/tmp/coverage',
+  workers int default 4,
+  force boolean default false
+  )
+returns setof text as $$
+import os
+from snoopUtils import export_coverage_jsons
+
+if workers is None or workers < 1:
+    plpy.error("workers must be at least 1, got {}".format(workers))
+
+# A release's json is built from its own audit events and open api spec, its row in
+# conformance.coverage_per_release, and the conformance tests.  If none of these changed
+# since the last export, the json would come out the same and the release is skipped.
+FINGERPRINTS_SQL = """
+  select l.release,
+         md5(concat_ws('|', l.loads, oa.api, cpr.coverage, t.tests)) as fingerprint
+    from (select release, string_agg(id||':'||event_count, ',' order by id) as loads
+            from audit_event_load
+           group by release) l
+    left join lateral (
+      select count(*)||':'||min(spec)||':'||min(release_date) as api
+        from open_api
+       where open_api.release = l.release) oa on true
+    left join lateral (
+      select c::text as coverage
+        from conformance.coverage_per_release c
+       where c.release = l.release::semver) cpr on true
+   cross join (
+      select md5(coalesce(string_agg(concat_ws(':', codename, testname, release, file), ',' order by codename), '')) as tests
+        from conformance.test) t
+   order by l.release::semver desc;
+"""
+
+# the exporter reads over its own connections, so it only sees committed data
+conn_info = plpy.execute("""
+  select current_database() as dbname,
+         current_user as "user",
+         current_setting('port') as port,
+         split_part(current_setting('unix_socket_directories'), ',', 1) as host
+""")[0]
+dsn = ' '.join(key + '=' + value for key, value in conn_info.items())
+
+fingerprints = {row['release']: row['fingerprint'] for row in plpy.execute(FINGERPRINTS_SQL)}
+exported = {row['release']: row['fingerprint'] for row in plpy.execute("select release, fingerprint from coverage_export")}
+stale = [release for release, fingerprint in fingerprints.items()
+         if force
+         or exported.get(release) != fingerprint
+         or not os.path.isfile(os.path.join(output_dir, release + '.json'))]
+
+build_log = [release + ' unchanged, skipping' for release in fingerprints if release not in stale]
+record_export = plpy.prepare("""
+  insert into coverage_export(release, fingerprint, path, exported_at)
+  values ($1, $2, $3, current_timestamp)
+  on conflict (release) do update
+     set fingerprint = excluded.fingerprint,
+         path = excluded.path,
+         exported_at = excluded.exported_at
+""", ["text", "text", "text"])
+# every release is attempted before failing, so one bad release doesn't hide the others
+failures = []
+for release, (path, error) in export_coverage_jsons(dsn, stale, output_dir, workers).items():
+    if error is None:
+        plpy.execute(record_export, [release, fingerprints[release], path])
+        build_log.append(release + ' coverage written to ' + path)
+    else:
+        failures.append(release + ': ' + error)
+if failures:
+    plpy.error("could not export coverage json for " + str(len(failures)) + " release(s)",
+               detail='\n'.join(failures))
+return build_log
+$$ LANGUAGE plpython3u;
+
+comment on function export_coverage_jsons is 'writes coverage json for every loaded release to OUTPUT_DIR/X.XX.X.json, WORKERS releases at a time.  Releases whose inputs are unchanged since their last export are skipped unless FORCE.  Raises once every release is attempted if any export failed';
+
+select 'export_coverage_jsons function defined and commented' as "build log";
@@ -5,14 +5,20 @@ create procedure update_pod_binding_events()
    */
   language plpgsql as $$
 begin
-  update audit_event
+  insert into audit_event_codename(test)
+  values ('[sig-node] Pods should delete a collection of pods [Conformance]')
+      on conflict (test) do nothing;
+
+  update audit_event_fact event
      set test_hit = true,
          conf_test_hit = true,
-         test = '[sig-node] Pods should delete a collection of pods [Conformance]'
-
-   where endpoint = 'createCoreV1NamespacedPodBinding'
-     and useragent like 'kube-scheduler%'
-     and data->>'requestURI' like '/api/v1/namespaces/pods-%/pods/test-pod-%/binding';
+         test_id = (select id from audit_event_codename
+                     where test = '[sig-node] Pods should delete a collection of pods [Conformance]')
+    from audit_event_useragent ua
+   where event.useragent_id = ua.id
+     and event.endpoint = 'createCoreV1NamespacedPodBinding'
+     and ua.useragent like 'kube-scheduler%'
+     and coalesce(event.data, archived_event_data(event.id))->>'requestURI' like '/api/v1/namespaces/pods-%/pods/test-pod-%/binding';
 end;
 $$;
 
@@ -2,12 +2,16 @@
 \getenv load_k8s_data LOAD_K8S_DATA
 select :load_k8s_data is not null as proceed;
 \gset
+\set archive_audit_event_data null
+\getenv archive_audit_event_data ARCHIVE_AUDIT_EVENT_DATA
+select coalesce(nullif(:'archive_audit_event_data', 'null'), 'false')::boolean as archive_data;
+\gset
 
 \if :proceed
 begin;
-select * from load_audit_events('ci-kubernetes-e2e-gci-gce') f("build log");
-select * from load_audit_events('ci-kubernetes-gce-conformance-latest') f("build log");
-select * from load_audit_events('ci-audit-kind-conformance') f("build log");
+select * from load_audit_events('ci-kubernetes-e2e-gci-gce', null, :'archive_data') f("build log");
+select * from load_audit_events('ci-kubernetes-gce-conformance-latest', null, :'archive_data') f("build log");
+select * from load_audit_events('ci-audit-kind-conformance', null, :'archive_data') f("build log");
 call update_pod_binding_events();
 commit;
 \else
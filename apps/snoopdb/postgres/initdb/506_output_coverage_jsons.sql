@@ -9,15 +9,9 @@ begin;
     CREATE FUNCTION array_distinct(anyarray) RETURNS anyarray AS $f$
   SELECT array_agg(DISTINCT x) FROM unnest($1) t(x);
 $f$ LANGUAGE SQL IMMUTABLE;
- select (select release from audit_event order by release limit 1) as latest_release
- \! mkdir -p /tmp/coverage
- \gset
- \set output_file '/tmp/coverage/':latest_release'.json'
+ select * from export_coverage_jsons('/tmp/coverage') f("build log");
  \t
  \a
- \o :output_file
-   select * from generate_latest_coverage_json();
- \o
  \o '/tmp/coverage/conformance-progress.json'
  select jsonb_pretty(json_agg(json_build_object(
  'release', release,
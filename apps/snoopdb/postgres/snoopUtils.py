@@ -16,17 +16,21 @@ from tempfile import mkdtemp
 import time
 import glob
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import psycopg2
+import yaml
 
 AKC_BUCKET="ci-audit-kind-conformance"
 KGCL_BUCKET="ci-kubernetes-gce-conformance-latest"
 KEGG_BUCKET="ci-kubernetes-e2e-gci-gce"
 CONFORMANCE_RUNS="https://prow.k8s.io/job-history/kubernetes-jenkins/logs/"
 
-AUDIT_KIND_CONFORMANCE_LOGS="https://storage.googleapis.com/kubernetes-jenkins/logs/ci-audit-kind-conformance"
 GCS_LOGS="https://storage.googleapis.com/kubernetes-jenkins/logs/"
 
 ARTIFACTS_PATH ='https://gcsweb.k8s.io/gcs/kubernetes-jenkins/logs/'
 K8S_GITHUB_REPO = 'https://raw.githubusercontent.com/kubernetes/kubernetes/'
+RELEASES_URL = "https://raw.githubusercontent.com/kubernetes-sigs/apisnoop/master/resources/coverage/releases.yaml"
+OPENAPI_SPEC_PATH = '/api/openapi-spec/swagger.json'
 
 Meta = namedtuple('Meta',['job','version','commit','log_links','timestamp'])
 
@@ -129,12 +133,18 @@ def load_openapi_spec(url):
     """
     Load given swagger url into a cache, so we can use it later to find operation id's
     """
+    swagger = cluster_swagger() if url == 'cluster' else requests.get(url).json()
+    return openapi_spec_from_swagger(swagger)
+
+def openapi_spec_from_swagger(swagger):
+    """
+    Load given swagger dict into a cache, so we can use it later to find operation id's
+    """
     # Usually, a Python dictionary throws a KeyError if you try to get an item with a key that is not currently in the dictionary.
     # The defaultdict in contrast will simply return an empty dict.
     cache=defaultdict(dict)
     openapi_spec = {}
     openapi_spec['hit_cache'] = {}
-    swagger = cluster_swagger() if url == 'cluster' else requests.get(url).json()
     # swagger contains other data, but paths is our primary target
     for path in swagger['paths']:
         # parts of the url of the 'endpoint'
@@ -314,199 +324,278 @@ def bucket_latest_success(bucket):
         raise ValueError("Cannot find success in builds")
     return latest_success['ID']
 
-def akc_version(job):
+class GCSSource:
+    """
+    Serves job artifacts from the kubernetes-jenkins gcs bucket, over http.
+    Every file and listing is fetched at most once per source, so composing a Meta
+    for a job does not hit the network for the same started/finished json over and over.
+    """
+    def __init__(self):
+        self.files = {}
+        self.listings = {}
+        self.releases_yaml = None
+
+    def read(self, bucket, job, path):
+        """return contents of file at path, relative to the given bucket/job, as a string"""
+        key = (bucket, job, path)
+        if key not in self.files:
+            url = GCS_LOGS + bucket + '/' + job + '/' + path
+            self.files[key] = urlopen(url).read().decode('utf-8')
+        return self.files[key]
+
+    def list(self, bucket, job, path, pattern):
+        """return names of entries in bucket/job/path that match given regex pattern"""
+        key = (bucket, job, path, pattern)
+        if key not in self.listings:
+            soup = get_html(ARTIFACTS_PATH + bucket + '/' + job + '/' + path)
+            links = soup.find_all(href=re.compile(pattern))
+            self.listings[key] = [os.path.basename(link['href'].rstrip('/')) for link in links]
+        return self.listings[key]
+
+    def latest_job(self, bucket):
+        return bucket_latest_success(bucket)
+
+    def fetch(self, bucket, job, path, local_path, dl_dict):
+        """start download of artifact at path into local_path, tracking it in dl_dict"""
+        download_url_to_path(GCS_LOGS + bucket + '/' + job + '/' + path, local_path, dl_dict)
+
+    def swagger(self, commit):
+        """return swagger.json of kubernetes/kubernetes at given commit, as dict"""
+        return requests.get(K8S_GITHUB_REPO + commit + OPENAPI_SPEC_PATH).json()
+
+    def releases(self):
+        """return kubernetes releases from apisnoop's releases.yaml, latest first"""
+        if self.releases_yaml is None:
+            self.releases_yaml = urlopen(RELEASES_URL).read().decode('utf-8')
+        return yaml.safe_load(self.releases_yaml)
+
+class MirrorSource:
+    """
+    Serves job artifacts from a local directory laid out like the kubernetes-jenkins/logs bucket,
+    e.g. <root>/ci-audit-kind-conformance/<job>/started.json.
+    The swagger for a commit is kept at <root>/kubernetes/kubernetes/<commit>/api/openapi-spec/swagger.json,
+    and apisnoop's releases.yaml at <root>/releases.yaml.
+    Reading from a mirror needs no network; see mirror_job for populating one.
+    """
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, bucket, job, path):
+        return os.path.join(self.root, bucket, job, path)
+
+    def read(self, bucket, job, path):
+        return Path(self.path(bucket, job, path)).read_text()
+
+    def list(self, bucket, job, path, pattern):
+        return sorted(name for name in os.listdir(self.path(bucket, job, path)) if re.search(pattern, name))
+
+    def latest_job(self, bucket):
+        """return the highest numbered job in the mirror whose finished.json reports success"""
+        jobs = sorted((job for job in os.listdir(os.path.join(self.root, bucket)) if job.isdigit()),
+                      key=int, reverse=True)
+        for job in jobs:
+            finished = self.path(bucket, job, 'finished.json')
+            if os.path.isfile(finished) and json.loads(Path(finished).read_text()).get('result') == 'SUCCESS':
+                return job
+        raise ValueError("Cannot find success in mirrored jobs", bucket)
+
+    def fetch(self, bucket, job, path, local_path, dl_dict):
+        """link the mirrored artifact into local_path; nothing to download"""
+        local_dir = os.path.dirname(local_path)
+        if not os.path.isdir(local_dir):
+            os.makedirs(local_dir)
+        if not os.path.lexists(local_path):
+            os.symlink(self.path(bucket, job, path), local_path)
+
+    def swagger(self, commit):
+        swagger_path = os.path.join(self.root, 'kubernetes', 'kubernetes', commit + OPENAPI_SPEC_PATH)
+        return json.loads(Path(swagger_path).read_text())
+
+    def releases(self):
+        return yaml.safe_load(Path(os.path.join(self.root, 'releases.yaml')).read_text())
+
+def get_source():
+    """
+    Return the source to read job artifacts from:
+    a MirrorSource when SNOOP_ARTIFACT_MIRROR is set to a mirror directory, otherwise GCSSource.
+    """
+    mirror = os.getenv('SNOOP_ARTIFACT_MIRROR')
+    return MirrorSource(mirror) if mirror else GCSSource()
+
+def parse_job_version(job_version):
+    """return k8s semver and k8s/k8s commit from a job-version like v1.26.0-alpha.0.275+41df8167dd82e7"""
+    version_match = re.match("^v([0-9.]+)-",job_version)
+    if version_match is None:
+        raise ValueError("Could not find version in given job_version.", job_version)
+    # we want the end of the string, after the '+'. A commit should only be numbers and letters
+    commit_match = re.match(".+\+([0-9a-zA-Z]+)$",job_version)
+    if commit_match is None:
+        raise ValueError("Could not find commit in given job_version.", job_version)
+    return version_match.group(1), commit_match.group(1)
+
+def akc_version(job, source=None):
     """return semver of kubernetes used for given akc job"""
-    versionfile_path = "/artifacts/logs/kind-control-plane/kubernetes-version.txt"
-    version_url =  AUDIT_KIND_CONFORMANCE_LOGS + "/" + job + versionfile_path
-    version_file = urlopen(version_url).read().decode()
+    source = source or get_source()
+    versionfile_path = "artifacts/logs/kind-control-plane/kubernetes-version.txt"
+    version_file = source.read(AKC_BUCKET, job, versionfile_path)
     # version_file will be something like v1.26.0-alpha.0.378+bcea98234f0fdc-dirty
     # We only want the k8s semver(in this example, the 1.26.0)
     # so, create a capture group of any number or '.' in between a starting 'v' and a '-'
     version = re.match("^v([0-9.]+)-",version_file).group(1)
     return version
 
-def akc_commit(job):
+def akc_commit(job, source=None):
     """return commit of kubernetes/kubernetes used for given akc job"""
-    started_url = AUDIT_KIND_CONFORMANCE_LOGS + "/" + job + "/started.json"
-    started = json.loads(urlopen(started_url).read().decode('utf-8'))
+    source = source or get_source()
+    started = json.loads(source.read(AKC_BUCKET, job, "started.json"))
     return started["repo-commit"]
 
-def akc_loglinks(job):
+def akc_loglinks(job, source=None):
     """
     grab all the audit logs from our ci-audit-kind-conformance bucket,
     since their names and locations are non-standard
     """
-    artifacts_url = ARTIFACTS_PATH + AKC_BUCKET + '/' +  job + '/' + 'artifacts/audit'
-    soup = get_html(artifacts_url)
-    return soup.find_all(href=re.compile(".log"))
+    source = source or get_source()
+    return ['artifacts/audit/' + name for name in source.list(AKC_BUCKET, job, 'artifacts/audit', ".log")]
 
-def akc_timestamp(job):
+def akc_timestamp(job, source=None):
     """return timestamp of when given akc job was run"""
-    started_url = AUDIT_KIND_CONFORMANCE_LOGS + "/" + job + "/started.json"
-    started = json.loads(urlopen(started_url).read().decode('utf-8'))
+    source = source or get_source()
+    started = json.loads(source.read(AKC_BUCKET, job, "started.json"))
     return started["timestamp"]
 
-def akc_meta(bucket, custom_job=None):
-    """
-    Compose a Meta object for job of given AKC bucket.
-    Meta object contains the job, the k8s version, the k8s commit, the audit log links for the test run, and thed timestamp of the testrun
-    """
-    job = bucket_latest_success(bucket) if custom_job is None else custom_job
-    return Meta(job,
-                akc_version(job),
-                akc_commit(job),
-                akc_loglinks(job),
-                akc_timestamp(job))
+def finished_job_version(bucket, job, source):
+    """return version and commit from the job-version in finished.json of given bucket's job"""
+    finished = json.loads(source.read(bucket, job, "finished.json"))
+    return parse_job_version(finished["metadata"]["job-version"])
+
+def finished_timestamp(bucket, job, source):
+    """Return unix timestamp of when given job was run, from its finished.json"""
+    finished = json.loads(source.read(bucket, job, "finished.json"))
+    return finished["timestamp"]
 
-def kgcl_version(job):
+def master_loglinks(bucket, job, source):
+    """Return all audit log links kept under the master node's artifacts"""
+    master = source.list(bucket, job, 'artifacts', "master")[0]
+    master_path = 'artifacts/' + master
+    return [master_path + '/' + name for name in source.list(bucket, job, master_path, "audit.log")]
+
+def kgcl_version(job, source=None):
     """
     return k8s semver for version of k8s run in given job's test run
     """
-    finished_url = GCS_LOGS + KGCL_BUCKET + '/' + job + '/finished.json'
-    finished = get_json(finished_url)
-    job_version = finished["metadata"]["job-version"]
-
-    match = re.match("^v([0-9.]+)-",job_version)
-    if match is None:
-        raise ValueError("Could not find version in given job_version.", job_version)
-    else:
-        version = match.group(1)
-        return version
+    return finished_job_version(KGCL_BUCKET, job, source or get_source())[0]
 
-def kgcl_commit(job):
+def kgcl_commit(job, source=None):
     """
     return k8s/k8s commit for k8s used in given job's test run
     """
-    # we want the end of the string, after the '+'. A commit should only be numbers and letters
-    finished_url = GCS_LOGS + KGCL_BUCKET + '/' + job + '/finished.json'
-    finished = get_json(finished_url)
-    job_version = finished["metadata"]["job-version"]
-
-    match = re.match(".+\+([0-9a-zA-Z]+)$",job_version)
-    if match is None:
-        raise ValueError("Could not find commit in given job_version", job_version)
-    else:
-        commit = match.group(1)
-        return commit
+    return finished_job_version(KGCL_BUCKET, job, source or get_source())[1]
 
-def kgcl_loglinks(job):
+def kgcl_loglinks(job, source=None):
     """Return all audit log links for KGCL bucket"""
-    artifacts_url = ARTIFACTS_PATH + KGCL_BUCKET + '/' +  job + '/' + 'artifacts'
-    soup = get_html(artifacts_url)
-    master_link = soup.find(href=re.compile("master"))
-    master_soup = get_html("https://gcsweb.k8s.io" + master_link['href'])
-    return master_soup.find_all(href=re.compile("audit.log"))
+    return master_loglinks(KGCL_BUCKET, job, source or get_source())
 
-def kgcl_timestamp(job):
+def kgcl_timestamp(job, source=None):
     """
     Return unix timestamp of when given job was run
     """
-    finished_url = GCS_LOGS + KGCL_BUCKET + '/' + job + '/finished.json'
-    finished = get_json(finished_url)
-    return finished["timestamp"]
+    return finished_timestamp(KGCL_BUCKET, job, source or get_source())
 
-def kgcl_meta(bucket, custom_job=None):
-    """
-    Compose a Meta object for job of given KGCL bucket.
-    Meta object contains the job, the k8s version, the k8s commit, the audit log links for the test run, and thed timestamp of the testrun
-    """
-    job = bucket_latest_success(bucket) if custom_job is None else custom_job
-    return Meta(job,
-                kgcl_version(job),
-                kgcl_commit(job),
-                kgcl_loglinks(job),
-                kgcl_timestamp(job))
-
-def kegg_version(job):
+def kegg_version(job, source=None):
     """
     return k8s semver for version of k8s run in given job's test run
     """
-    finished_url = GCS_LOGS + KEGG_BUCKET + '/' + job + '/finished.json'
-    finished = get_json(finished_url)
-    job_version = finished["metadata"]["job-version"]
+    return finished_job_version(KEGG_BUCKET, job, source or get_source())[0]
 
-    match = re.match("^v([0-9.]+)-",job_version)
-    if match is None:
-        raise ValueError("Could not find version in given job_version.", job_version)
-    else:
-        version = match.group(1)
-        return version
-
-def kegg_commit(job):
+def kegg_commit(job, source=None):
     """
     return k8s/k8s commit for k8s used in given job's test run
     """
-    # we want the end of the string, after the '+'. A commit should only be numbers and letters
-    finished_url = GCS_LOGS + KEGG_BUCKET + '/' + job + '/finished.json'
-    finished = get_json(finished_url)
-    job_version = finished["metadata"]["job-version"]
-    match = re.match(".+\+([0-9a-zA-Z]+)$",job_version)
-    if match is None:
-        raise ValueError("Could not find commit in given job_version.", job_version)
-    else:
-        commit = match.group(1)
-        return commit
+    return finished_job_version(KEGG_BUCKET, job, source or get_source())[1]
 
-def kegg_loglinks(job):
+def kegg_loglinks(job, source=None):
     """Return all audit log links for KEGG bucket"""
-    artifacts_url = ARTIFACTS_PATH + KEGG_BUCKET + '/' +  job + '/' + 'artifacts'
-    soup = get_html(artifacts_url)
-    master_link = soup.find(href=re.compile("master"))
-    master_soup = get_html("https://gcsweb.k8s.io" + master_link['href'])
-    return master_soup.find_all(href=re.compile("audit.log"))
+    return master_loglinks(KEGG_BUCKET, job, source or get_source())
 
-def kegg_timestamp(job):
+def kegg_timestamp(job, source=None):
     """
     Return unix timestamp of when given job was run
     """
-    finished_url = GCS_LOGS + KEGG_BUCKET + '/' + job + '/finished.json'
-    finished = get_json(finished_url)
-    return finished["timestamp"]
+    return finished_timestamp(KEGG_BUCKET, job, source or get_source())
 
-def kegg_meta(bucket, custom_job=None):
-    """
-    Compose a Meta object for job of given KEGG bucket.
-    Meta object contains the job, the k8s version, the k8s commit, the audit log links for the test run, and thed timestamp of the testrun
-    """
-    job = bucket_latest_success(bucket) if custom_job is None else custom_job
-    return Meta(job,
-                kegg_version(job),
-                kegg_commit(job),
-                kegg_loglinks(job),
-                kegg_timestamp(job))
+# for each bucket, the functions giving version, commit, log links and timestamp of a job
+BUCKET_META = {
+    AKC_BUCKET: (akc_version, akc_commit, akc_loglinks, akc_timestamp),
+    KGCL_BUCKET: (kgcl_version, kgcl_commit, kgcl_loglinks, kgcl_timestamp),
+    KEGG_BUCKET: (kegg_version, kegg_commit, kegg_loglinks, kegg_timestamp)
+}
 
-def get_meta(bucket,job=None):
+def get_meta(bucket,job=None,source=None):
     """Returns meta object for given bucket.
-    Meta includes job, k8s version, k8s commit, all auditlog links, and timestamp of the test run"""
-    if(bucket == AKC_BUCKET):
-        return akc_meta(bucket,job)
-    elif(bucket == KGCL_BUCKET):
-        return kgcl_meta(bucket,job)
-    elif(bucket == KEGG_BUCKET):
-        return kegg_meta(bucket, job)
+    Meta includes job, k8s version, k8s commit, all auditlog links, and timestamp of the test run.
+    If no job is given, uses the latest successful job of the bucket"""
+    if bucket not in BUCKET_META:
+        raise ValueError("No meta known for given bucket", bucket)
+    source = source or get_source()
+    job = source.latest_job(bucket) if job is None else job
+    version, commit, loglinks, timestamp = BUCKET_META[bucket]
+    return Meta(job,
+                version(job, source),
+                commit(job, source),
+                loglinks(job, source),
+                timestamp(job, source))
+
+def wait_for_downloads(downloads):
+    """block until every download process in given downloads dict has finished"""
+    for download in downloads.keys():
+        # Sleep for 5 seconds and check for next download
+        while downloads[download].poll() is None:
+            time.sleep(5)
 
-def download_and_process_auditlogs(bucket,job):
+def mirror_job(bucket, job, mirror_root):
+    """
+    Copy everything needed to ingest given bucket/job from gcs into a local mirror at mirror_root,
+    so it can later be re-ingested by a MirrorSource without network.
+    """
+    gcs = GCSSource()
+    meta = get_meta(bucket, job, gcs)
+    # MirrorSource.latest_job looks for a successful finished.json
+    gcs.read(bucket, job, 'finished.json')
+    mirror = MirrorSource(mirror_root)
+    for (file_bucket, file_job, path), contents in gcs.files.items():
+        local_path = mirror.path(file_bucket, file_job, path)
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        Path(local_path).write_text(contents)
+    downloads = {}
+    for log_path in meta.log_links:
+        gcs.fetch(bucket, job, log_path, mirror.path(bucket, job, log_path), downloads)
+    wait_for_downloads(downloads)
+    swagger_path = os.path.join(mirror_root, 'kubernetes', 'kubernetes', meta.commit + OPENAPI_SPEC_PATH)
+    os.makedirs(os.path.dirname(swagger_path), exist_ok=True)
+    Path(swagger_path).write_text(json.dumps(gcs.swagger(meta.commit)))
+    gcs.releases()
+    Path(os.path.join(mirror_root, 'releases.yaml')).write_text(gcs.releases_yaml)
+    return meta
+
+def download_and_process_auditlogs(bucket,job,source=None):
     """
     Grabs all audits logs available for a given bucket/job, combines them into a
     single audit log, then returns the path for where the raw combined audit logs are stored.
     The processed logs are in json, and include the operationId when found.
     """
+    source = source or get_source()
     downloads = {}
-    # bucket_url = BUCKETS_PATH + bucket + '/' + job + '/'
     download_path = mkdtemp( dir='/tmp', prefix='apisnoop-' + bucket + '-' + job ) + '/'
     combined_log_file = download_path + 'combined-audit.log'
-    meta = get_meta(bucket,job)
+    meta = get_meta(bucket,job,source)
 
-    for link in meta.log_links:
-        log_url = link['href']
-        log_file = download_path + os.path.basename(log_url)
-        download_url_to_path(log_url, log_file, downloads)
+    for log_path in meta.log_links:
+        log_file = download_path + os.path.basename(log_path)
+        source.fetch(bucket, job, log_path, log_file, downloads)
 
-    # Our Downloader uses subprocess of curl for speed
-    for download in downloads.keys():
-        # Sleep for 5 seconds and check for next download
-        while downloads[download].poll() is None:
-            time.sleep(5)
+    # Our Downloader uses subprocess of wget for speed
+    wait_for_downloads(downloads)
 
     # Loop through the files, (z)cat them into a combined audit.log
     with open(combined_log_file, 'ab') as log:
@@ -518,8 +607,7 @@ def download_and_process_auditlogs(bucket,job):
                 subprocess.run(['cat', logfile], stdout=log, check=True)
 
     # Process the resulting combined raw audit.log by adding operationId
-    swagger_url = K8S_GITHUB_REPO + meta.commit + '/api/openapi-spec/swagger.json'
-    openapi_spec = load_openapi_spec(swagger_url)
+    openapi_spec = openapi_spec_from_swagger(source.swagger(meta.commit))
     infilepath=combined_log_file
     outfilepath=combined_log_file+'+opid'
     with open(infilepath) as infile:
@@ -531,3 +619,147 @@ def download_and_process_auditlogs(bucket,job):
                 event['snoopError'] = err
                 output.write(json.dumps(event)+'\n')
     return outfilepath
+
+COVERAGE_SUMMARY_SQL = """
+  select row_to_json(c) from (
+    select oa.release, oa.release_date, oa.spec,
+           cpr."total endpoints" as "total conformance eligible endpoints",
+           cpr."total tested" as "tested conformance eligible endpoints",
+           cpr."new endpoints" as "new conformance eligible endpoints",
+           cpr.tested as "new tested conformance eligible endpoints"
+      from (select release, release_date, spec
+              from open_api
+             where release = %(release)s
+             group by release, release_date, spec
+             limit 1) oa
+      left join conformance.coverage_per_release cpr on(oa.release::semver = cpr.release::semver)) c;
+"""
+
+COVERAGE_SOURCES_SQL = """
+  select source from audit_event_load where release = %(release)s group by source order by source;
+"""
+
+COVERAGE_TESTS_SQL = """
+  select row_to_json(audit_event_test) from audit_event_test where release = %(release)s order by test;
+"""
+
+COVERAGE_ENDPOINTS_SQL = """
+  select row_to_json(endpoint_coverage)
+    from endpoint_coverage
+   where release = %(release)s
+     and endpoint is not null
+   order by level desc, endpoint;
+"""
+
+def jsonb_key(key):
+    """sort key that orders object keys the way jsonb stores them: shortest first, then bytewise"""
+    encoded = key.encode('utf-8')
+    return (len(encoded), encoded)
+
+def jsonb_ordered(value):
+    """return value with the keys of every object in it ordered as jsonb would"""
+    if isinstance(value, dict):
+        return {key: jsonb_ordered(value[key]) for key in sorted(value, key=jsonb_key)}
+    if isinstance(value, list):
+        return [jsonb_ordered(item) for item in value]
+    return value
+
+def pretty_json(value, depth):
+    """format value as jsonb_pretty does, for nesting at the given depth"""
+    text = json.dumps(jsonb_ordered(value), indent=4, ensure_ascii=False)
+    return text.replace('\n', '\n' + '    ' * depth)
+
+def write_json_rows(out, rows, depth):
+    """write rows as a json array one row at a time; like array_agg, no rows is null"""
+    written = False
+    for row in rows:
+        out.write(',\n' if written else '[\n')
+        out.write('    ' * (depth + 1) + pretty_json(row, depth + 1))
+        written = True
+    out.write('\n' + '    ' * depth + ']' if written else 'null')
+
+def write_coverage_json(out, summary, tests, endpoints):
+    """
+    Write the coverage json of a release to out, in the format of generate_latest_coverage_json.
+    summary holds the scalar members, tests and endpoints are iterables of row dicts
+    that are written as they are read, so the whole document is never held in memory.
+    The endpoint counts are taken while the endpoints are written.
+    """
+    all_endpoints = set()
+    tested_endpoints = set()
+    def counted(rows):
+        for row in rows:
+            all_endpoints.add(row['endpoint'])
+            if row['tested']:
+                tested_endpoints.add(row['endpoint'])
+            yield row
+    count_keys = ('total endpoints', 'tested endpoints')
+    keys = sorted(list(summary) + ['tests', 'endpoints'] + list(count_keys), key=jsonb_key)
+    # the counts are only known once the endpoints are written
+    if any(keys.index(key) < keys.index('endpoints') for key in count_keys):
+        raise ValueError("endpoint counts must follow endpoints in coverage json", keys)
+    out.write('{\n')
+    for idx, key in enumerate(keys):
+        out.write('    ' + json.dumps(key, ensure_ascii=False) + ': ')
+        if key == 'tests':
+            write_json_rows(out, tests, 1)
+        elif key == 'endpoints':
+            write_json_rows(out, counted(endpoints), 1)
+        elif key == 'total endpoints':
+            out.write(pretty_json(len(all_endpoints), 1))
+        elif key == 'tested endpoints':
+            out.write(pretty_json(len(tested_endpoints), 1))
+        else:
+            out.write(pretty_json(summary[key], 1))
+        out.write(',\n' if idx < len(keys) - 1 else '\n')
+    out.write('}\n')
+
+def export_coverage_json(dsn, release, output_dir):
+    """
+    Write the coverage json for given release to output_dir/<release>.json and return its path.
+    Rows are streamed from server side cursors in a single read only snapshot.
+    """
+    conn = psycopg2.connect(dsn)
+    try:
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        params = {'release': release}
+        with conn.cursor() as cur:
+            cur.execute(COVERAGE_SUMMARY_SQL, params)
+            row = cur.fetchone()
+            if row is None:
+                raise ValueError("No open api spec loaded for release", release)
+            summary = row[0]
+            cur.execute(COVERAGE_SOURCES_SQL, params)
+            summary['sources'] = [source for (source,) in cur.fetchall()] or None
+        tests = conn.cursor(name='coverage_tests')
+        tests.itersize = 1000
+        tests.execute(COVERAGE_TESTS_SQL, params)
+        endpoints = conn.cursor(name='coverage_endpoints')
+        endpoints.itersize = 1000
+        endpoints.execute(COVERAGE_ENDPOINTS_SQL, params)
+        path = os.path.join(output_dir, release + '.json')
+        with open(path + '.tmp', 'w') as out:
+            write_coverage_json(out, summary,
+                                (test for (test,) in tests),
+                                (endpoint for (endpoint,) in endpoints))
+        os.replace(path + '.tmp', path)
+        return path
+    finally:
+        conn.close()
+
+def export_coverage_jsons(dsn, releases, output_dir='/tmp/coverage', workers=4):
+    """
+    Export coverage jsons for given releases, up to workers releases at a time, each on its own connection.
+    Returns a dict of release to (path, error), error being None when the export succeeded.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1", workers)
+    os.makedirs(output_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {release: pool.submit(export_coverage_json, dsn, release, output_dir)
+                   for release in releases}
+    results = {}
+    for release, future in futures.items():
+        error = future.exception()
+        results[release] = (None, str(error)) if error else (future.result(), None)
+    return results
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import snoopUtils as s
+import io
 import json
+import os
 import pytest
 import random
 from bs4 import BeautifulSoup
@@ -194,3 +196,79 @@ def test_kegg_timestamp():
     timestamp = s.kegg_timestamp(job)
     timestamp_match = re.match("^[0-9]+$",str(timestamp))
     assert timestamp_match is not None
+
+def make_mirror(root):
+    job = root / s.KGCL_BUCKET / "1234"
+    master = job / "artifacts" / "bootstrap-e2e-master"
+    master.mkdir(parents=True)
+    (master / "kube-apiserver-audit.log").write_text("")
+    (master / "kube-apiserver.log").write_text("")
+    (job / "finished.json").write_text(json.dumps({
+        "timestamp": 1660000000,
+        "result": "SUCCESS",
+        "metadata": {"job-version": "v1.26.0-alpha.0.275+41df8167dd82e7"}
+    }))
+    (root / "releases.yaml").write_text("- version: 1.26.0\n  release_date: 2022-12-08\n")
+    failed = root / s.KGCL_BUCKET / "1235"
+    failed.mkdir()
+    (failed / "finished.json").write_text(json.dumps({"result": "FAILURE"}))
+
+def test_parse_job_version():
+    version, commit = s.parse_job_version("v1.26.0-alpha.0.275+41df8167dd82e7")
+    assert version == "1.26.0"
+    assert commit == "41df8167dd82e7"
+    with pytest.raises(ValueError):
+        s.parse_job_version("1.26.0")
+
+def test_mirror_source_meta(tmp_path):
+    make_mirror(tmp_path)
+    source = s.MirrorSource(str(tmp_path))
+    meta = s.get_meta(s.KGCL_BUCKET, source=source)
+    assert meta.job == "1234"
+    assert meta.version == "1.26.0"
+    assert meta.commit == "41df8167dd82e7"
+    assert meta.log_links == ["artifacts/bootstrap-e2e-master/kube-apiserver-audit.log"]
+    assert meta.timestamp == 1660000000
+
+def test_mirror_source_fetch(tmp_path):
+    make_mirror(tmp_path)
+    source = s.MirrorSource(str(tmp_path))
+    local_path = str(tmp_path / "download" / "kube-apiserver-audit.log")
+    downloads = {}
+    source.fetch(s.KGCL_BUCKET, "1234", "artifacts/bootstrap-e2e-master/kube-apiserver-audit.log", local_path, downloads)
+    assert downloads == {}
+    assert os.path.realpath(local_path) == str(tmp_path / s.KGCL_BUCKET / "1234" / "artifacts/bootstrap-e2e-master/kube-apiserver-audit.log")
+
+def test_jsonb_ordered():
+    ordered = s.jsonb_ordered({"tests": [], "spec": "", "release_date": "", "release": "", "sources": []})
+    assert list(ordered.keys()) == ["spec", "tests", "release", "sources", "release_date"]
+
+def test_write_coverage_json():
+    out = io.StringIO()
+    summary = {"release": "1.29.0", "spec": "swagger.json"}
+    endpoints = [
+        {"endpoint": "readCoreV1Node", "tested": True, "tests": ["a test"]},
+        {"endpoint": "listCoreV1Node", "tested": False, "tests": [None]}
+    ]
+    s.write_coverage_json(out, summary, iter([]), iter(endpoints))
+    written = out.getvalue()
+    assert json.loads(written) == {
+        "spec": "swagger.json",
+        "tests": None,
+        "release": "1.29.0",
+        "endpoints": endpoints,
+        "total endpoints": 2,
+        "tested endpoints": 1
+    }
+    assert written.startswith('{\n    "spec": "swagger.json",\n    "tests": null,\n')
+    assert '    "endpoints": [\n        {\n            "tests": [\n                "a test"\n            ],\n' in written
+    assert written.endswith('    "tested endpoints": 1\n}\n')
+
+def test_mirror_source_releases(tmp_path):
+    make_mirror(tmp_path)
+    source = s.MirrorSource(str(tmp_path))
+    assert source.releases()[0]["version"] == "1.26.0"
+
+def test_export_coverage_jsons_needs_a_worker(tmp_path):
+    with pytest.raises(ValueError):
+        s.export_coverage_jsons("", ["1.29.0"], str(tmp_path), workers=0)